@@ -3,6 +3,8 @@ import time
 import re
 import asyncio
 import os
+from functools import lru_cache
+from urllib.parse import urlsplit
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
 
@@ -21,6 +23,8 @@ try:
         resolve_and_normalize_amazon_url,
         domain_to_currency,
         format_price,
+        get_client,
+        close_client,
     )
 except ImportError:
     from db import db
@@ -36,6 +40,8 @@ except ImportError:
         resolve_and_normalize_amazon_url,
         domain_to_currency,
         format_price,
+        get_client,
+        close_client,
     )
 
 AMAZON_URL_RE = re.compile(
@@ -91,22 +97,26 @@ async def ensure_user_in_db(update: Update) -> None:
     if user:
         db.ensure_user(user.id, user.username, user.first_name, user.last_name)
 
+HOST_PREFIX_RE = re.compile(r'^(?:www|m|smile)\.')
+
+@lru_cache(maxsize=64)
+def _normalize_amazon_host(netloc: str) -> Optional[str]:
+    """Lowercase an Amazon host and strip www./m./smile. (None if not Amazon)."""
+    host = netloc.lower()
+    if not host:
+        return None
+    if 'amazon.' not in host and not host.startswith('amzn.'):
+        return None
+    return HOST_PREFIX_RE.sub('', host)
+
 def extract_domain(url: str) -> Optional[str]:
     """Extract and normalize the Amazon domain (strip www., m., smile.)."""
     try:
         if not url:
             return None
-        # Ensure we have a scheme for regex
+        # Ensure we have a scheme so urlsplit sees the host as netloc
         tmp = url if url.startswith(('http://', 'https://')) else 'https://' + url
-        m = re.search(r'https?://([^/]+)/', tmp + '/')
-        if not m:
-            return None
-        host = m.group(1).lower()
-        if 'amazon.' not in host and not host.startswith('amzn.'):
-            return None
-        # Normalize prefixes
-        host = re.sub(r'^(?:www|m|smile)\.', '', host)
-        return host
+        return _normalize_amazon_host(urlsplit(tmp).netloc)
     except Exception:
         return None
 
@@ -163,7 +173,7 @@ async def send_price_notification(user_id: int, asin: str, title: str, old_price
         image_url: Optional[str] = None
         try:
             # Fetch product data from PA API to get image
-            _title, _price, _currency, img, _avail = fetch_product_data_legal(asin, dom)
+            _title, _price, _currency, img, _avail = await fetch_product_data_legal(asin, dom)
             image_url = img
         except Exception as e:
             logger.warning("Could not fetch image from PA API", error=str(e))
@@ -213,31 +223,53 @@ async def refresh_prices_and_notify(app: Application) -> None:
         if not domain_group:
             return
 
-        sem = asyncio.Semaphore(10)
+        # Bulkhead: bound PA API lookups waiting in worker threads across the refresh
+        # (the client itself paces requests to 1/s, more threads would only sit blocked)
+        sem = asyncio.Semaphore(max(1, config.fetch_concurrency))
+        # Keepa queries draw on one account token budget: run them one domain at a time
+        keepa_sem = asyncio.Semaphore(1)
 
         async def fetch_current_data(asin: str, domain: str):
             """Fetch current product data from Amazon PA API (legal method)"""
             async with sem:
                 try:
                     # Use PA API instead of scraping (100% legal)
-                    title_s, price_s, currency_s, _img, avail = fetch_product_data_legal(asin, domain)
+                    title_s, price_s, currency_s, _img, avail = await fetch_product_data_legal(asin, domain)
                     return asin, title_s, price_s, currency_s, avail
                 except Exception as e:
                     logger.warning("PA API fetch failed", asin=asin, domain=domain, error=str(e))
                     return asin, None, None, None, None
 
-        updated_items = 0
-        for dom, asin_map in domain_group.items():
+        async def fetch_domain(dom: str, asin_map: dict[str, list[dict]]):
+            """Fetch Keepa bounds and PA API data for every ASIN of one domain"""
             asins_dom = list(asin_map.keys())
-            # Fetch prices for NEW+USED (all sellers)
-            keepa_bounds_dom = fetch_lifetime_min_max_current(asins_dom, domain=dom, new_only=False)
+            # Fetch prices for NEW+USED (all sellers) in a worker thread (blocking Keepa client),
+            # overlapping with the concurrent PA API lookups below
+            async def keepa_bounds():
+                async with keepa_sem:
+                    return await asyncio.to_thread(fetch_lifetime_min_max_current, asins_dom, domain=dom, new_only=False)
+            keepa_task = keepa_bounds()
             # Fetch current data from PA API concurrently
             tasks = [fetch_current_data(a, dom) for a in asins_dom]
+            keepa_bounds_dom, fetched = await asyncio.gather(keepa_task, asyncio.gather(*tasks))
             api_results: dict[str, tuple[str | None, float | None, str | None, str | None]] = {}
-            if tasks:
-                for asin, t, p, c, a in await asyncio.gather(*tasks):
-                    api_results[asin] = (t, p, c, a)
+            for asin, t, p, c, a in fetched:
+                api_results[asin] = (t, p, c, a)
+            return keepa_bounds_dom, api_results
 
+        # All domains are fetched in one batch: PA API calls are paced globally by the client
+        # and Keepa queries are serialized, so the overlap is between the two backends
+        domain_items = list(domain_group.items())
+        domain_results = await asyncio.gather(
+            *(fetch_domain(dom, asin_map) for dom, asin_map in domain_items), return_exceptions=True
+        )
+
+        updated_items = 0
+        for (dom, asin_map), result in zip(domain_items, domain_results):
+            if isinstance(result, BaseException):
+                logger.warning("Refresh fetch failed for domain", domain=dom, error=str(result))
+                continue
+            keepa_bounds_dom, api_results = result
             for asin, lst in asin_map.items():
                 k_min, k_max, k_cur = keepa_bounds_dom.get(asin, (None, None, None)) if keepa_bounds_dom else (None, None, None)
                 api_title, api_price, api_currency, api_avail = api_results.get(asin, (None, None, None, None))
@@ -474,19 +506,13 @@ async def handle_shared_link(update: Update, context: ContextTypes.DEFAULT_TYPE)
             # Second chance: if it's a short domain, try a live fetch to follow redirect (already done in resolver, but safety)
             if any(s in url for s in ("a.co/", "amzn.to", "amzn.eu", "amzn.in", "amzn.asia")):
                 try:
-                    import httpx
-                    from src.config import config as _cfg
-                except ImportError:
-                    import httpx
-                    from config import config as _cfg
-                try:
-                    async with httpx.AsyncClient(follow_redirects=True, timeout=10, headers={"User-Agent": _cfg.user_agent}) as client:
-                        resp = await client.get(url)
+                    client = await get_client()
+                    async with client.stream("GET", url, timeout=10) as resp:
                         final_url = str(resp.url)
-                        if final_url != url:
-                            logger.info("Short link second redirect followed", initial=url, final=final_url)
-                        url = final_url
-                        asin = extract_asin(url)
+                    if final_url != url:
+                        logger.info("Short link second redirect followed", initial=url, final=final_url)
+                    url = final_url
+                    asin = extract_asin(url)
                 except Exception as _e:
                     logger.warning("Short link secondary expansion failed", url=url, error=str(_e))
         if not asin:
@@ -553,7 +579,7 @@ async def handle_shared_link(update: Update, context: ContextTypes.DEFAULT_TYPE)
             return
 
         # Get product title, current price and image using PA API (legal method)
-        title, current_price, currency, image_url, availability = fetch_product_data_legal(asin, domain)
+        title, current_price, currency, image_url, availability = await fetch_product_data_legal(asin, domain)
         if not title:
             title = f"Amazon Product {asin}"
 
@@ -570,7 +596,7 @@ async def handle_shared_link(update: Update, context: ContextTypes.DEFAULT_TYPE)
             pass
         spinner_stop_2 = asyncio.Event()
         spinner_task_2 = asyncio.create_task(run_spinner(msg, "Fetching price history...", ["⌛", "⏳"], spinner_stop_2, 0.7))
-        keepa_data = fetch_lifetime_min_max_current([asin], domain=domain)
+        keepa_data = await asyncio.to_thread(fetch_lifetime_min_max_current, [asin], domain=domain)
         min_price, max_price, current_price_from_keepa = keepa_data.get(asin, (None, None, None))
 
         # Fallback: if Keepa has no history yet, initialize with current price
@@ -585,7 +611,7 @@ async def handle_shared_link(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 logger.info("Initialized min/max from Keepa current (no Keepa history)", asin=asin, current=current_price_from_keepa)
             else:
                 # As a last attempt try simpler Keepa call without current
-                alt_bounds = fetch_lifetime_min_max([asin], domain=domain)
+                alt_bounds = await asyncio.to_thread(fetch_lifetime_min_max, [asin], domain=domain)
                 alt_min, alt_max = alt_bounds.get(asin, (None, None))
                 if alt_min is not None and alt_max is not None:
                     min_price, max_price = alt_min, alt_max
@@ -596,7 +622,7 @@ async def handle_shared_link(update: Update, context: ContextTypes.DEFAULT_TYPE)
             # Try a forced fresh Keepa fetch to see if history becomes available immediately
             if min_price and max_price and current_price and min_price == max_price == current_price:
                 try:
-                    force_data = fetch_lifetime_min_max_current([asin], domain=domain, force=True)
+                    force_data = await asyncio.to_thread(fetch_lifetime_min_max_current, [asin], domain=domain, force=True)
                     fmin, fmax, fcur = force_data.get(asin, (None, None, None))
                     if fmin and fmax and (fmin != fmax or fmin != current_price):
                         min_price, max_price = fmin, fmax
@@ -985,7 +1011,7 @@ def main() -> None:
             from .keepa_client import fetch_keepa_debug_data  # type: ignore
         except Exception:
             from keepa_client import fetch_keepa_debug_data  # type: ignore
-        dbg = fetch_keepa_debug_data(asin_arg)
+        dbg = await asyncio.to_thread(fetch_keepa_debug_data, asin_arg)
         if dbg.get("error"):
             await update.message.reply_text(f"Error: {dbg.get('error')}")
             return
@@ -1054,6 +1080,12 @@ def main() -> None:
         asyncio.create_task(periodic_price_check(application))
     
     app.post_init = post_init_combined
+
+    # Release the shared HTTP connection pool on shutdown
+    async def post_shutdown_close_http(application: Application) -> None:
+        await close_client()
+
+    app.post_shutdown = post_shutdown_close_http
     
     logger.info("Amazon Price Tracker Bot started successfully - Price tracking and notifications active")
     app.run_polling()
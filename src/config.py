@@ -27,6 +27,7 @@ class Config:
     # HTTP
     request_timeout_seconds: int = int(os.getenv("REQUEST_TIMEOUT_SECONDS", "20"))
     user_agent: str = os.getenv("USER_AGENT", "Mozilla/5.0")
+    fetch_concurrency: int = int(os.getenv("FETCH_CONCURRENCY", "2"))  # max queued PA API lookups during refresh (API is 1 req/s)
     # Affiliate
     affiliate_tag: str = os.getenv("AFFILIATE_TAG", "bestbuytracker-21")
     # Amazon Product Advertising API (PA API 5.0) - LEGAL alternative to scraping
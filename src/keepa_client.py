@@ -1,6 +1,13 @@
-from typing import Dict, Tuple, Optional, List, Any
+from typing import Dict, Tuple, Optional, List, Any, NamedTuple
+import json
 import math
+from itertools import islice
 import keepa  # type: ignore
+import urllib3
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson optional
+    orjson = None  # type: ignore
 try:
     from .config import config
     from .logger import logger
@@ -23,6 +30,33 @@ DomainMap = {
     "com.mx": 11,
 }
 
+class PricePair(NamedTuple):
+    """Lifetime (min, max) prices for one ASIN; unpacks like a plain tuple."""
+    min: Optional[float]
+    max: Optional[float]
+
+class PriceTriple(NamedTuple):
+    """Lifetime (min, max, current) prices for one ASIN; unpacks like a plain tuple."""
+    min: Optional[float]
+    max: Optional[float]
+    current: Optional[float]
+
+KEEPA_PRODUCT_URL = "https://api.keepa.com/product"
+# Keepa timestamps (trackingSince / lastUpdate) are expressed in minutes
+_SINGLE_DAY_KEEPA_MINUTES = 24 * 60
+
+# Shared keep-alive pool for the raw HTTP fallback path (no per-call client setup)
+_POOL = urllib3.PoolManager(maxsize=10, retries=False)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _keepa_http_get(params: Dict[str, str]) -> Dict[str, Any]:
+    """GET the Keepa product endpoint via the shared pool and decode the JSON body."""
+    timeout = getattr(config, "request_timeout_seconds", 20) or 20
+    resp = _POOL.request("GET", KEEPA_PRODUCT_URL, fields=params, timeout=timeout)
+    if resp.status >= 400:
+        raise urllib3.exceptions.HTTPError(f"Keepa HTTP {resp.status}")
+    return _json_loads(resp.data)
+
 def fetch_keepa_debug_data(asin: str, domain: Optional[str] = None) -> Dict[str, Any]:  # diagnostic utility
     """Fetch raw Keepa product and expose parsing diagnostics for a single ASIN.
     Returns a dict with keys: asin, domain, stats_min_raw, stats_max_raw, stats_current_raw,
@@ -32,7 +66,6 @@ def fetch_keepa_debug_data(asin: str, domain: Optional[str] = None) -> Dict[str,
     if not key or not asin:
         return {"error": "Missing key or ASIN"}
     try:
-        import httpx
         params = {
             "key": key,
             "domain": str(get_keepa_domain_id(domain)),
@@ -40,12 +73,7 @@ def fetch_keepa_debug_data(asin: str, domain: Optional[str] = None) -> Dict[str,
             "stats": "1800",
             "history": "1",
         }
-        url = "https://api.keepa.com/product"
-        timeout = getattr(config, "request_timeout_seconds", 20) or 20
-        with httpx.Client(timeout=timeout) as client:
-            resp = client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        data = _keepa_http_get(params)
         products = data.get("products") or []
         if not products:
             return {"error": "No product data returned"}
@@ -74,7 +102,7 @@ def fetch_keepa_debug_data(asin: str, domain: Optional[str] = None) -> Dict[str,
                 if isinstance(primary, (list, tuple)) and len(primary) >= 2:
                     a, b = primary[0], primary[1]
                     sample = [a, b]
-                    # Mirror logic from _pick_amazon_stat.extract_from_pair
+                    # Mirror logic from _extract_from_pair
                     if isinstance(a, (int, float)) and isinstance(b, (int, float)):
                         if a > 2_000_000 and b < 2_000_000:
                             return float(b), "pair_b_is_price", sample
@@ -114,18 +142,13 @@ def fetch_keepa_debug_data(asin: str, domain: Optional[str] = None) -> Dict[str,
         raw_min, min_reason, min_sample = _debug_interpret(raw_min_entry)
         raw_max, max_reason, max_sample = _debug_interpret(raw_max_entry)
         raw_current, cur_reason, cur_sample = _debug_interpret(raw_current_entry)
-        # Use existing parser for final interpreted values
-        parsed = _parse_keepa_products_with_current([p])
+        # Use existing parser for final interpreted values; it also hands back the
+        # history bounds and csv[0] samples so the series is only scanned once.
+        history: Dict[str, Tuple[Optional[float], Optional[float], List[float]]] = {}
+        parsed = _parse_keepa_products_with_current([p], history_out=history)
         parsed_min, parsed_max, parsed_current = parsed.get(asin, (None, None, None))
-        hmin, hmax = _minmax_from_history(p)
-        sample_prices: List[float] = []
-        csv0 = p.get("csv")[0] if isinstance(p.get("csv"), (list, tuple)) and p.get("csv") else None
-        if isinstance(csv0, (list, tuple)):
-            for idx, v in enumerate(csv0):
-                if len(sample_prices) >= 12:
-                    break
-                if idx % 2 == 1 and isinstance(v, (int, float)) and v > 0:
-                    sample_prices.append(round(v / 100.0, 2))
+        hmin, hmax, raw_samples = history.get(asin, (None, None, []))
+        sample_prices: List[float] = [round(v / 100.0, 2) for v in raw_samples[:12]]
         # Additional context: list price / buy box if present
         def _pick_first(stats_dict, keys):
             for k in keys:
@@ -219,8 +242,8 @@ def get_keepa_domain_name(domain_override: Optional[str] = None) -> str:
     return mapping.get(dom, "US")
 
 @retry_with_backoff(max_retries=3, exceptions=(Exception,))
-def fetch_lifetime_min_max_current(asin_list: List[str], domain: Optional[str] = None, force: bool = False, new_only: bool = False) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[float]]]:
-    """Return {asin: (min, max, current)} lifetime prices (always fetched fresh).
+def fetch_lifetime_min_max_current(asin_list: List[str], domain: Optional[str] = None, force: bool = False, new_only: bool = False) -> Dict[str, PriceTriple]:
+    """Return {asin: PriceTriple(min, max, current)} lifetime prices (always fetched fresh).
     
     Args:
         asin_list: List of ASINs to fetch
@@ -243,14 +266,14 @@ def fetch_lifetime_min_max_current(asin_list: List[str], domain: Optional[str] =
                 return circuit_breakers['keepa_api'].call(_fetch_via_http_with_current, asin_list, key, domain, new_only)
             except Exception as e:
                 logger.error("All Keepa methods failed", error=str(e))
-                return {asin: (None, None, None) for asin in asin_list}
+                return {asin: PriceTriple(None, None, None) for asin in asin_list}
     except Exception as e:
         logger.error("Keepa API failed", error=str(e), asins=len(asin_list))
-        return {asin: (None, None, None) for asin in asin_list}
+        return {asin: PriceTriple(None, None, None) for asin in asin_list}
 
 @retry_with_backoff(max_retries=3, exceptions=(Exception,))
-def fetch_lifetime_min_max(asin_list: List[str], domain: Optional[str] = None, force: bool = False) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
-    """Return {asin: (min, max)} lifetime prices (fresh fetch)."""
+def fetch_lifetime_min_max(asin_list: List[str], domain: Optional[str] = None, force: bool = False) -> Dict[str, PricePair]:
+    """Return {asin: PricePair(min, max)} lifetime prices (fresh fetch)."""
     key = (getattr(config, "keepa_api_key", "") or "").strip()
     if not key or not asin_list:
         return {}
@@ -264,12 +287,12 @@ def fetch_lifetime_min_max(asin_list: List[str], domain: Optional[str] = None, f
                 return circuit_breakers['keepa_api'].call(_fetch_via_http, asin_list, key, domain)
             except Exception as e:
                 logger.error("All Keepa methods failed", error=str(e))
-                return {asin: (None, None) for asin in asin_list}
+                return {asin: PricePair(None, None) for asin in asin_list}
     except Exception as e:
         logger.error("Keepa API failed", error=str(e), asins=len(asin_list))
-        return {asin: (None, None) for asin in asin_list}
+        return {asin: PricePair(None, None) for asin in asin_list}
 
-def _fetch_from_keepa_package_with_current(key: str, asin_list: List[str], domain: Optional[str], new_only: bool = False) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[float]]]:
+def _fetch_from_keepa_package_with_current(key: str, asin_list: List[str], domain: Optional[str], new_only: bool = False) -> Dict[str, PriceTriple]:
     """Fetch from keepa package with current prices"""
     api = keepa.Keepa(key)
     products_resp = api.query(
@@ -281,7 +304,7 @@ def _fetch_from_keepa_package_with_current(key: str, asin_list: List[str], domai
     products = _normalize_products(products_resp)
     return _parse_keepa_products_with_current(products, new_only)
 
-def _fetch_from_pykeepa_with_current(key: str, asin_list: List[str], domain: Optional[str], new_only: bool = False) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[float]]]:
+def _fetch_from_pykeepa_with_current(key: str, asin_list: List[str], domain: Optional[str], new_only: bool = False) -> Dict[str, PriceTriple]:
     """Fetch from pykeepa with current prices"""
     import pykeepa  # type: ignore
     try:
@@ -297,7 +320,7 @@ def _fetch_from_pykeepa_with_current(key: str, asin_list: List[str], domain: Opt
     products = _normalize_products(products_resp)
     return _parse_keepa_products_with_current(products, new_only)
 
-def _fetch_from_keepa_package(key: str, asin_list: List[str], domain: Optional[str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+def _fetch_from_keepa_package(key: str, asin_list: List[str], domain: Optional[str]) -> Dict[str, PricePair]:
     """Fetch from keepa package"""
     api = keepa.Keepa(key)
     products_resp = api.query(
@@ -309,7 +332,7 @@ def _fetch_from_keepa_package(key: str, asin_list: List[str], domain: Optional[s
     products = _normalize_products(products_resp)
     return _parse_keepa_products(products)
 
-def _fetch_from_pykeepa(key: str, asin_list: List[str], domain: Optional[str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+def _fetch_from_pykeepa(key: str, asin_list: List[str], domain: Optional[str]) -> Dict[str, PricePair]:
     """Fetch from pykeepa"""
     import pykeepa  # type: ignore
     try:
@@ -326,6 +349,20 @@ def _fetch_from_pykeepa(key: str, asin_list: List[str], domain: Optional[str]) -
     return _parse_keepa_products(products)
 
 
+def _extract_from_pair(a, b):
+    """Return the price element of a Keepa stat pair (timestamp vs price by magnitude)."""
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        if a > 2_000_000 and b < 2_000_000:
+            return b
+        if b > 2_000_000 and a < 2_000_000:
+            return a
+        if a < 200_000 and b > 200_000:  # typical price cents (<2000.00) vs timestamp
+            return a
+        # Default Keepa ordering
+        return a
+    return None
+
+
 def _pick_amazon_stat(stats: dict, key: str, new_only: bool = False) -> Optional[float]:
     """Extract Amazon price (in cents) for the requested stat key.
 
@@ -357,25 +394,25 @@ def _pick_amazon_stat(stats: dict, key: str, new_only: bool = False) -> Optional
     if val is None:
         return None
 
-    def extract_from_pair(a, b):
-        # Identify timestamp vs price by magnitude
-        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
-            if a > 2_000_000 and b < 2_000_000:
-                return b
-            if b > 2_000_000 and a < 2_000_000:
-                return a
-            if a < 200_000 and b > 200_000:  # typical price cents (<2000.00) vs timestamp
-                return a
-            # Default Keepa ordering
-            return a
-        return None
+    # Select the appropriate index based on new_only flag
+    # Index 0 = Amazon, Index 1 = NEW offers, Index 2 = USED offers
+    # Keepa stats array: [Amazon, NEW, Used, ?, Sales, ListPrice, ...]
+    target_index = 1 if new_only else 0
+
+    # Fast path for the overwhelmingly common shape: a plain list whose target
+    # entry is an int price or an [int, int] pair. Exact type checks keep this
+    # branch cheap; anything else falls through to the generic handling below.
+    if type(val) is list and len(val) > target_index:
+        primary = val[target_index]
+        if type(primary) is int:
+            if 0 < primary < 2_000_000:
+                return float(primary)
+        elif type(primary) is list and len(primary) >= 2 and type(primary[0]) is int and type(primary[1]) is int:
+            price = _extract_from_pair(primary[0], primary[1])
+            if 0 < price < 2_000_000:
+                return float(price)
 
     if isinstance(val, (list, tuple)):
-        # Select the appropriate index based on new_only flag
-        # Index 0 = Amazon, Index 1 = NEW offers, Index 2 = USED offers
-        # Keepa stats array: [Amazon, NEW, Used, ?, Sales, ListPrice, ...]
-        target_index = 1 if new_only else 0
-        
         # Direct candidates (condition at target_index)
         primary = val[target_index] if len(val) > target_index else (val[0] if len(val) > 0 else None)
         
@@ -385,7 +422,7 @@ def _pick_amazon_stat(stats: dict, key: str, new_only: bool = False) -> Optional
         
         candidates = []
         if isinstance(primary, (list, tuple)) and len(primary) >= 2:
-            price = extract_from_pair(primary[0], primary[1])
+            price = _extract_from_pair(primary[0], primary[1])
             if isinstance(price, (int, float)) and 0 < price < 2_000_000:
                 return float(price)
         elif isinstance(primary, (int, float)) and 0 < primary < 2_000_000:
@@ -403,7 +440,7 @@ def _pick_amazon_stat(stats: dict, key: str, new_only: bool = False) -> Optional
                     continue
                 price = None
                 if isinstance(v, (list, tuple)) and len(v) >= 2:
-                    price = extract_from_pair(v[0], v[1])
+                    price = _extract_from_pair(v[0], v[1])
                 elif isinstance(v, (int, float)):
                     price = v if 0 < v < 2_000_000 else None
                 if isinstance(price, (int, float)) and 0 < price < 2_000_000:
@@ -421,7 +458,7 @@ def _pick_amazon_stat(stats: dict, key: str, new_only: bool = False) -> Optional
             if isinstance(v, (int, float)) and 0 < v < 2_000_000:
                 return float(v)
             if isinstance(v, (list, tuple)) and len(v) >= 2:
-                extracted = extract_from_pair(v[0], v[1])
+                extracted = _extract_from_pair(v[0], v[1])
                 if isinstance(extracted, (int, float)) and 0 < extracted < 2_000_000:
                     return float(extracted)
         return None
@@ -431,37 +468,50 @@ def _pick_amazon_stat(stats: dict, key: str, new_only: bool = False) -> Optional
     return None
 
 
+def _norm_dict(products_resp: dict) -> List[dict]:
+    if 'products' in products_resp and isinstance(products_resp['products'], list):
+        return [p for p in products_resp['products'] if isinstance(p, dict)]
+    # Single product dict
+    if 'asin' in products_resp or 'stats' in products_resp:
+        return [products_resp]
+    return []
+
+def _norm_list(products_resp) -> List[dict]:
+    # Tuple where first element is list of products
+    if len(products_resp) > 0 and isinstance(products_resp[0], list):
+        first = products_resp[0]
+        return [p for p in first if isinstance(p, dict)]
+    return [p for p in products_resp if isinstance(p, dict)]
+
+# Response shape handlers keyed by exact type; subclasses take the isinstance fallback
+_NORM_DISPATCH = {dict: _norm_dict, list: _norm_list, tuple: _norm_list}
+
 def _normalize_products(products_resp) -> List[dict]:
     """Normalize various keepa/pykeepa response shapes into a list of product dicts."""
     if not products_resp:
         return []
-    # Dict shapes
-    if isinstance(products_resp, dict):
-        if 'products' in products_resp and isinstance(products_resp['products'], list):
-            return [p for p in products_resp['products'] if isinstance(p, dict)]
-        # Single product dict
-        if 'asin' in products_resp or 'stats' in products_resp:
-            return [products_resp]
-        return []
-    # List/tuple shapes
-    if isinstance(products_resp, (list, tuple)):
-        # Tuple where first element is list of products
-        if len(products_resp) > 0 and isinstance(products_resp[0], list):
-            first = products_resp[0]
-            return [p for p in first if isinstance(p, dict)]
-        return [p for p in products_resp if isinstance(p, dict)]
-    return []
+    handler = _NORM_DISPATCH.get(type(products_resp))
+    if handler is None:
+        if isinstance(products_resp, dict):
+            handler = _norm_dict
+        elif isinstance(products_resp, (list, tuple)):
+            handler = _norm_list
+        else:
+            return []
+    return handler(products_resp)
 
     # Removed unused helper _extract_prices_from_stat_array (cleanup)
 
-def _parse_keepa_products_with_current(products: List[dict], new_only: bool = False) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[float]]]:
+def _parse_keepa_products_with_current(products: List[dict], new_only: bool = False, history_out: Optional[Dict[str, Tuple[Optional[float], Optional[float], List[float]]]] = None) -> Dict[str, PriceTriple]:
     """Parse Keepa products to extract min, max, and current prices with diagnostics.
     
     Args:
         products: List of product dicts from Keepa
         new_only: If True, use stats index 18 (NEW offers), else index 0 (Amazon)
+        history_out: Optional dict filled with {asin: (history_min, history_max, csv0_samples)}.
+                     When given, history is computed for every product (diagnostic callers).
     """
-    out: Dict[str, Tuple[Optional[float], Optional[float], Optional[float]]] = {}
+    out: Dict[str, PriceTriple] = {}
     for p in products or []:
         asin = (p.get('asin') or '').strip()
         if not asin:
@@ -486,29 +536,25 @@ def _parse_keepa_products_with_current(products: List[dict], new_only: bool = Fa
             if (not isinstance(raw_max, (int, float)) or raw_max <= 0) and isinstance(raw_current, (int, float)) and raw_current > 0:
                 raw_max = raw_current
 
-        # History fallback if stats missing OR trivial (min==max==current)
-        need_history = (
+        # History fallback if stats missing OR trivial (min==max==current); skipped when
+        # there is no history to parse or the product is too young to have a wider one
+        need_history = _has_history(p) and (
             not isinstance(raw_min, (int, float))
             or not isinstance(raw_max, (int, float))
             or raw_min <= 0
             or raw_max <= 0
-            or (isinstance(raw_current, (int, float)) and raw_min == raw_max == raw_current)
+            or (isinstance(raw_current, (int, float)) and raw_min == raw_max == raw_current and not _is_single_day_product(p))
         )
+        if need_history or history_out is not None:
+            # Resolve csv[0] once and share it between the history parser and the samples
+            csv0 = _csv0(p)
+            hmin, hmax = _minmax_from_series(_history_series(p, csv0))
+            sample_values = _sample_prices(csv0, 20)
+            if history_out is not None:
+                history_out[asin] = (hmin, hmax, sample_values)
         if need_history:
-            hmin, hmax = _minmax_from_history(p)
             # Extra diagnostics when history requested
             try:
-                csv0 = p.get('csv')[0] if isinstance(p.get('csv'), (list, tuple)) and p.get('csv') else None
-                sample_values = []
-                if isinstance(csv0, (list, tuple)):
-                    # Extract first 20 price entries (odd indices if alternating)
-                    extracted = []
-                    for idx, v in enumerate(csv0):
-                        if len(extracted) >= 20:
-                            break
-                        if idx % 2 == 1 and isinstance(v, (int, float)) and v > 0:
-                            extracted.append(v)
-                    sample_values = extracted
                 logger.debug("Keepa history diagnostic", asin=asin, history_min=hmin, history_max=hmax, sample_len=len(sample_values), sample=sample_values[:10])
             except Exception:
                 pass
@@ -538,12 +584,12 @@ def _parse_keepa_products_with_current(products: List[dict], new_only: bool = Fa
             logger.debug("Keepa final prices", asin=asin, min=min_price, max=max_price, current=current_price)
         except Exception:
             pass
-        out[asin] = (min_price, max_price, current_price)
+        out[asin] = PriceTriple(min_price, max_price, current_price)
     return out
 
-def _parse_keepa_products(products: List[dict]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+def _parse_keepa_products(products: List[dict]) -> Dict[str, PricePair]:
     """Parse Keepa products (min/max only) with diagnostics."""
-    out: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+    out: Dict[str, PricePair] = {}
     for p in products or []:
         asin = (p.get('asin') or '').strip()
         if not asin:
@@ -568,12 +614,12 @@ def _parse_keepa_products(products: List[dict]) -> Dict[str, Tuple[Optional[floa
                 if isinstance(c, (int, float)) and c > 0:
                     raw_max = c
 
-        need_history = (
+        need_history = _has_history(p) and (
             not isinstance(raw_min, (int, float))
             or not isinstance(raw_max, (int, float))
             or raw_min <= 0
             or raw_max <= 0
-            or (isinstance(raw_min, (int, float)) and isinstance(raw_max, (int, float)) and raw_min == raw_max)
+            or (isinstance(raw_min, (int, float)) and isinstance(raw_max, (int, float)) and raw_min == raw_max and not _is_single_day_product(p))
         )
         if need_history:
             hmin, hmax = _minmax_from_history(p)
@@ -596,31 +642,70 @@ def _parse_keepa_products(products: List[dict]) -> Dict[str, Tuple[Optional[floa
             logger.debug("Keepa final prices (no current)", asin=asin, min=min_price, max=max_price)
         except Exception:
             pass
-        out[asin] = (min_price, max_price)
+        out[asin] = PricePair(min_price, max_price)
     return out
 
+def _has_history(product: dict) -> bool:
+    """True when the product carries any history arrays worth parsing."""
+    return bool(product.get('csv') or product.get('data'))
+
+def _is_single_day_product(product: dict) -> bool:
+    """True when Keepa started tracking the product less than a day before its last update.
+
+    Such products cannot have a history wider than their stats, so a trivial
+    min==max==current is genuine rather than a reason to parse the history.
+    """
+    since = product.get('trackingSince')
+    last = product.get('lastUpdate')
+    if not isinstance(since, (int, float)) or not isinstance(last, (int, float)) or since <= 0:
+        return False
+    return 0 <= last - since < _SINGLE_DAY_KEEPA_MINUTES
+
+def _csv0(product: dict) -> Optional[list]:
+    """Return the csv[0] (Amazon) history series of a product, if present."""
+    csv = product.get('csv')
+    if isinstance(csv, (list, tuple)) and len(csv) > 0 and isinstance(csv[0], (list, tuple)):
+        return csv[0]
+    return None
+
+def _sample_prices(csv0: Optional[list], limit: int) -> List[float]:
+    """First `limit` positive price entries (odd indices) of a csv[0] series."""
+    samples: List[float] = []
+    if csv0:
+        for v in islice(csv0, 1, None, 2):
+            if len(samples) >= limit:
+                break
+            if isinstance(v, (int, float)) and v > 0:
+                samples.append(v)
+    return samples
+
+def _history_series(product: dict, csv0: Optional[list] = None) -> Optional[list]:
+    """Pick the history series: product['data'][AMAZON] style first, then csv[0]."""
+    data = product.get('data') or {}
+    if isinstance(data, dict):
+        for k in ('AMAZON', 'amazon', 0, '0', 'NEW', 'new', 1, '1'):
+            seq = data.get(k)
+            if isinstance(seq, (list, tuple)) and len(seq) >= 4:
+                return seq
+    if csv0 is None:
+        csv0 = _csv0(product)
+    if csv0 is not None and len(csv0) >= 4:
+        return csv0
+    return None
+
 def _minmax_from_history(product: dict) -> Tuple[Optional[float], Optional[float]]:
-    """Compute min/max (in cents) from Keepa history arrays with robust timestamp filtering.
+    """Compute min/max (in cents) from Keepa history arrays with robust timestamp filtering."""
+    return _minmax_from_series(_history_series(product))
+
+def _minmax_from_series(series: Optional[list]) -> Tuple[Optional[float], Optional[float]]:
+    """Compute min/max (in cents) from an already selected Keepa history series.
 
     Heuristics:
-    - Prefer product['data'][AMAZON] style series; fallback to csv[0].
     - Detect alternating timestamp/value pattern by monotonicity of one subset (timestamps grow).
     - If ambiguity remains, treat subset with median >> other OR median > 1e6 as timestamps.
     - Filter unrealistic price cents (> 2,000,000 = 20,000.00) as timestamps/outliers.
     - If after filtering no prices remain, return (None, None).
     """
-    data = product.get('data') or {}
-    series = None
-    if isinstance(data, dict):
-        for k in ('AMAZON', 'amazon', 0, '0', 'NEW', 'new', 1, '1'):
-            seq = data.get(k)
-            if isinstance(seq, (list, tuple)) and len(seq) >= 4:
-                series = seq
-                break
-    if series is None:
-        csv = product.get('csv')
-        if isinstance(csv, (list, tuple)) and len(csv) > 0 and isinstance(csv[0], (list, tuple)) and len(csv[0]) >= 4:
-            series = csv[0]
     if not isinstance(series, (list, tuple)) or len(series) < 4:
         return None, None
 
@@ -704,8 +789,7 @@ def _minmax_from_history(product: dict) -> Tuple[Optional[float], Optional[float
     return (min(filtered), max(filtered))
 
 
-def _fetch_via_http_with_current(asin_list: List[str], api_key: str, domain: Optional[str], new_only: bool = False) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[float]]]:
-    import httpx  # lazy import
+def _fetch_via_http_with_current(asin_list: List[str], api_key: str, domain: Optional[str], new_only: bool = False) -> Dict[str, PriceTriple]:
     params = {
         "key": api_key,
     "domain": str(get_keepa_domain_id(domain)),
@@ -713,12 +797,7 @@ def _fetch_via_http_with_current(asin_list: List[str], api_key: str, domain: Opt
         "stats": "1800",
         "history": "1",
     }
-    url = "https://api.keepa.com/product"
-    timeout = getattr(config, "request_timeout_seconds", 20) or 20
-    with httpx.Client(timeout=timeout) as client:
-        resp = client.get(url, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+    data = _keepa_http_get(params)
     products = data.get("products") or []
     # Normalize to the same structure parser expects
     norm = []
@@ -729,11 +808,12 @@ def _fetch_via_http_with_current(asin_list: List[str], api_key: str, domain: Opt
             # Preserve history arrays for fallback parsing
             "csv": p.get("csv"),
             "data": p.get("data"),
+            "trackingSince": p.get("trackingSince"),
+            "lastUpdate": p.get("lastUpdate"),
         })
     return _parse_keepa_products_with_current(norm, new_only)
 
-def _fetch_via_http(asin_list: List[str], api_key: str, domain: Optional[str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
-    import httpx  # lazy import
+def _fetch_via_http(asin_list: List[str], api_key: str, domain: Optional[str]) -> Dict[str, PricePair]:
     params = {
         "key": api_key,
     "domain": str(get_keepa_domain_id(domain)),
@@ -741,12 +821,7 @@ def _fetch_via_http(asin_list: List[str], api_key: str, domain: Optional[str]) -
         "stats": "1800",
         "history": "1",
     }
-    url = "https://api.keepa.com/product"
-    timeout = getattr(config, "request_timeout_seconds", 20) or 20
-    with httpx.Client(timeout=timeout) as client:
-        resp = client.get(url, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+    data = _keepa_http_get(params)
     products = data.get("products") or []
     # Normalize to the same structure parser expects
     norm = []
@@ -756,5 +831,7 @@ def _fetch_via_http(asin_list: List[str], api_key: str, domain: Optional[str]) -
             "stats": p.get("stats", {}),
             "csv": p.get("csv"),
             "data": p.get("data"),
+            "trackingSince": p.get("trackingSince"),
+            "lastUpdate": p.get("lastUpdate"),
         })
     return _parse_keepa_products(norm)
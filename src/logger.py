@@ -1,10 +1,102 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
 import json
 from datetime import datetime
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson optional
+    orjson = None  # type: ignore
+
+if orjson is not None:
+    def _dumps(data: dict) -> str:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+else:
+    # Same output as the orjson path: compact separators, raw UTF-8, str() for unknown types
+    def _dumps(data: dict) -> str:
+        return json.dumps(data, default=str, ensure_ascii=False, separators=(',', ':'))
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records unformatted.
+
+    The default prepare() formats on the calling thread; records here stay in
+    process and their message is already a JSON string, so the line formatting
+    is left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that batches writes, flushing on size, on interval, or on errors."""
+
+    BUFFER_CAPACITY = 65536
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, filename, mode: str = 'a', encoding: Optional[str] = None,
+                 capacity: int = BUFFER_CAPACITY, flush_interval: float = FLUSH_INTERVAL):
+        super().__init__(filename, mode, encoding)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._buffer: list = []
+        self._buffered = 0
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name='log-flush', daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        # The handler lock (re-entrant) guards the buffer and the file together
+        self.acquire()
+        try:
+            self._buffer.append(line)
+            self._buffered += len(line)
+            if self._buffered >= self.capacity or record.levelno >= logging.ERROR:
+                self.flush()
+        finally:
+            self.release()
+
+    def flush(self) -> None:
+        # Swap and write under one lock so concurrent flushes keep lines in order
+        self.acquire()
+        try:
+            if not self._buffer:
+                return
+            data = ''.join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(data)
+            self.stream.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        # Stop the flusher first so it cannot reopen the file after it is closed
+        self._stop.set()
+        if self._flusher is not threading.current_thread():
+            self._flusher.join()
+        self.flush()
+        super().close()
+
+
 class StructuredLogger:
     """Structured logger with JSON output and multiple levels"""
     
@@ -14,6 +106,7 @@ class StructuredLogger:
         
         # Clear existing handlers
         self.logger.handlers.clear()
+        handlers = []
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
@@ -21,36 +114,47 @@ class StructuredLogger:
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # File handler if specified
         if log_file:
             log_path = Path(log_file)
             log_path.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(log_path)
+            file_handler = BufferedFileHandler(log_path)
+            atexit.register(file_handler.close)
             file_formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+
+        # Callers only enqueue; formatting and I/O run on the listener thread
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.logger.addHandler(_DeferredQueueHandler(self._queue))
+        self._listener = logging.handlers.QueueListener(self._queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self._listener.stop)
+
+        # Level name -> bound logger method, resolved once
+        self._dispatch = {
+            'ERROR': self.logger.error,
+            'WARNING': self.logger.warning,
+            'INFO': self.logger.info,
+            'DEBUG': self.logger.debug,
+        }
     
     def _log_structured(self, level: str, message: str, **kwargs):
         """Log with structured data"""
         log_data = {
-            'timestamp': datetime.now().isoformat(),
+            # orjson serializes datetime natively (same ISO format), no isoformat() needed
+            'timestamp': datetime.now() if orjson is not None else datetime.now().isoformat(),
             'level': level,
             'message': message,
             **kwargs
         }
-        
-        if level == 'ERROR':
-            self.logger.error(json.dumps(log_data))
-        elif level == 'WARNING':
-            self.logger.warning(json.dumps(log_data))
-        elif level == 'INFO':
-            self.logger.info(json.dumps(log_data))
-        else:
-            self.logger.debug(json.dumps(log_data))
+        # Serialize once on the calling thread: handlers share the string, and caller-owned
+        # mutable kwargs are captured as they are now, not when the listener gets to them
+        self._dispatch.get(level, self.logger.debug)(_dumps(log_data))
     
     def info(self, message: str, **kwargs):
         self._log_structured('INFO', message, **kwargs)
@@ -62,6 +166,9 @@ class StructuredLogger:
         self._log_structured('WARNING', message, **kwargs)
     
     def debug(self, message: str, **kwargs):
+        # Skip building the payload entirely when DEBUG is filtered out
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         self._log_structured('DEBUG', message, **kwargs)
 
 # Global logger instance
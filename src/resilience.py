@@ -1,5 +1,8 @@
 import asyncio
+import random
+import threading
 import time
+from time import monotonic
 from typing import Callable, Any, Optional, Dict
 from functools import wraps
 from dataclasses import dataclass
@@ -24,20 +27,23 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time: Optional[float] = None
         self.state = CircuitState.CLOSED
+        # Breakers are shared across worker threads (asyncio.to_thread), guard state changes
+        self._lock = threading.Lock()
     
     def _should_attempt_reset(self) -> bool:
         return (
             self.state == CircuitState.OPEN and
             self.last_failure_time is not None and
-            time.time() - self.last_failure_time >= self.config.recovery_timeout
+            monotonic() - self.last_failure_time >= self.config.recovery_timeout
         )
     
     def call(self, func: Callable, *args, **kwargs) -> Any:
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-            else:
-                raise Exception("Circuit breaker is OPEN")
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                if self._should_attempt_reset():
+                    self.state = CircuitState.HALF_OPEN
+                else:
+                    raise Exception("Circuit breaker is OPEN")
         
         try:
             result = func(*args, **kwargs)
@@ -48,15 +54,20 @@ class CircuitBreaker:
             raise e
     
     def _on_success(self):
-        self.failure_count = 0
-        self.state = CircuitState.CLOSED
+        with self._lock:
+            self.failure_count = 0
+            self.state = CircuitState.CLOSED
     
     def _on_failure(self):
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.config.failure_threshold:
-            self.state = CircuitState.OPEN
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = monotonic()
+            
+            if self.failure_count >= self.config.failure_threshold:
+                self.state = CircuitState.OPEN
+
+# Seeded once at import; shared by all retry decorators
+_rng = random.Random()
 
 # Retry decorator with exponential backoff
 def retry_with_backoff(
@@ -64,9 +75,24 @@ def retry_with_backoff(
     base_delay: float = 1.0,
     max_delay: float = 60.0,
     backoff_factor: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    backoff: str = "full_jitter"
 ):
-    """Retry decorator with exponential backoff"""
+    """Retry decorator with exponential backoff.
+
+    The default backoff="full_jitter" sleeps a uniform random time in [0, exponential delay]
+    (AWS "Full Jitter") so concurrent callers failing together don't retry in lockstep.
+    Pass backoff="exponential" for the plain deterministic delays.
+    """
+    if backoff not in ("exponential", "full_jitter"):
+        raise ValueError(f"Unknown backoff strategy: {backoff}")
+
+    def compute_delay(attempt: int) -> float:
+        delay = min(base_delay * (backoff_factor ** attempt), max_delay)
+        if backoff == "full_jitter":
+            delay = _rng.uniform(0, delay)
+        return delay
+
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
@@ -83,8 +109,7 @@ def retry_with_backoff(
                     if attempt == max_retries:
                         break
                     
-                    delay = min(base_delay * (backoff_factor ** attempt), max_delay)
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(compute_delay(attempt))
             
             raise last_exception
         
@@ -100,8 +125,7 @@ def retry_with_backoff(
                     if attempt == max_retries:
                         break
                     
-                    delay = min(base_delay * (backoff_factor ** attempt), max_delay)
-                    time.sleep(delay)
+                    time.sleep(compute_delay(attempt))
             
             raise last_exception
         
@@ -1,70 +1,127 @@
 ﻿import re
 from typing import Optional, Tuple
-from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+from urllib.parse import urlparse, urlsplit, parse_qsl, urlencode, urlunparse, quote_plus
 import asyncio
+from functools import lru_cache
 import httpx
 try:
     from .config import config
+    from .logger import logger
 except ImportError:  # fallback when run directly
     from config import config
+    from logger import logger
 
 ASIN_RE = re.compile(r'/([A-Z0-9]{10})(?:[/?]|$)')
+_ASIN_FULLMATCH = re.compile(r'[A-Z0-9]{10}').fullmatch
 
+# parse_price_text patterns (compiled once)
+_CUR_RE = re.compile(r'(USD|EUR|GBP|CHF|CAD|AUD|£|€|\$)')
+_WORDS_RE = re.compile(r'(?i)(ttc|iva|tax(es)?|incl\.?|compr\.?|sped\.?|gratuit)')
+_CURRENCY_SYMBOL_ISO = {'£': 'GBP', '€': 'EUR', '$': 'USD'}
+# Currencies whose Amazon storefronts (it/de/fr/es) write a decimal comma
+_COMMA_DECIMAL_CURRENCIES = frozenset({'EUR'})
+
+class _PriceCharTable(dict):
+    """str.translate table keeping ASCII digits and . , separators, dropping everything else."""
+    def __missing__(self, key: int) -> None:
+        self[key] = None
+        return None
+
+_PRICE_CHARS = _PriceCharTable({ord(c): ord(c) for c in '0123456789.,'})
+
+# Shared keep-alive client (created lazily inside the running event loop)
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+# Pure URL/currency helpers below are memoized process-wide (bounded LRU): the same
+# product URLs and domains come back on every refresh cycle.
+_HELPER_CACHE_SIZE = 8192
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared pooled AsyncClient, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            # Fail fast on unreachable hosts; the overall budget still comes from config
+            timeout=httpx.Timeout(config.request_timeout_seconds, connect=5),
+            headers={"User-Agent": config.user_agent},
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30),
+        )
+    return _CLIENT
+
+async def close_client() -> None:
+    """Close the shared AsyncClient (call on application shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+@lru_cache(maxsize=_HELPER_CACHE_SIZE)
 def extract_asin(url: str) -> Optional[str]:
+    # Fast path for the common /dp/ASIN shape; same terminator rule as ASIN_RE
+    i = url.find('/dp/')
+    if i != -1:
+        cand = url[i + 4:i + 14]
+        if _ASIN_FULLMATCH(cand) and url[i + 14:i + 15] in ('', '/', '?'):
+            return cand
     m = ASIN_RE.search(url)
     return m.group(1) if m else None
 
+@lru_cache(maxsize=_HELPER_CACHE_SIZE)
 def normalize_amazon_url(url: str) -> str:
     asin = extract_asin(url)
     if not asin:
         return url
-    import re as _re
-    m = _re.match(r'(https?://[^/]+)/', url)
-    if not m:
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.netloc or not parts.path.startswith('/'):
         return url
-    domain = m.group(1)
-    return f"{domain}/dp/{asin}"
+    return f"{parts.scheme}://{parts.netloc}/dp/{asin}"
 
-def parse_price_text(text: str) -> Tuple[Optional[float], Optional[str]]:
+def parse_price_text(text: str, hint_currency: Optional[str] = None) -> Tuple[Optional[float], Optional[str]]:
     """Parse a localized Amazon price string into (float, currency).
     Handles formats like:
       12,34 €  |  €12,34  |  1.234,56 €  |  1 234,56 €  |  $12.34  |  12,34 EUR
+    When hint_currency is given (e.g. domain_to_currency(domain)) the decimal separator
+    is taken from it instead of guessed, so "1.234 €" parses as 1234.0 for EUR.
     """
     raw = text.strip()
-    import re as _re
-    # Normalize non‑breaking spaces
-    raw = raw.replace('\u202f', ' ').replace('\xa0', ' ')
     # Extract currency symbol (leading or trailing)
     currency = None
-    cur_match = _re.search(r'(USD|EUR|GBP|CHF|CAD|AUD|£|€|\$)', raw)
+    cur_match = _CUR_RE.search(raw)
     if cur_match:
         sym = cur_match.group(1)
         # Map symbols to ISO if possible
-        symbol_map = {'£': 'GBP', '€': 'EUR', '$': 'USD'}
-        currency = symbol_map.get(sym, sym)
-    # Remove currency words/symbols to isolate number
-    number_part = _re.sub(r'(USD|EUR|GBP|CHF|CAD|AUD|£|€|\$)', '', raw, flags=_re.IGNORECASE)
-    # Remove words like TTC, IVA, taxes, etc.
-    number_part = _re.sub(r'(?i)(ttc|iva|tax(es)?|incl\.?|compr\.?|sped\.?|gratuit)', '', number_part)
-    # Remove spaces (thousand separators) but keep separators . or ,
-    number_part = _re.sub(r'\s+', '', number_part)
-    # Keep only digits and separators
-    clean = _re.sub(r'[^0-9.,]', '', number_part)
+        currency = _CURRENCY_SYMBOL_ISO.get(sym, sym)
+    # Remove words like TTC, IVA, taxes, etc. (only needed for their trailing dots),
+    # then keep only digits and separators in one pass: currency symbols/codes and
+    # (non-breaking) spaces used as thousand separators are dropped by the table
+    clean = _WORDS_RE.sub('', raw).translate(_PRICE_CHARS)
+    if hint_currency:
+        if hint_currency.upper() in _COMMA_DECIMAL_CURRENCIES:
+            clean = clean.replace('.', '').replace(',', '.')
+        else:
+            clean = clean.replace(',', '')
+        try:
+            return float(clean), currency
+        except Exception:
+            return None, currency
+    last_comma = clean.rfind(',')
+    last_dot = clean.rfind('.')
     # Heuristic: if both separators present decide decimal
-    if clean.count(',') > 0 and clean.count('.') > 0:
+    if last_comma != -1 and last_dot != -1:
         # Last occurring separator is decimal
-        if clean.rfind(',') > clean.rfind('.'):
+        if last_comma > last_dot:
             # comma decimal => remove dots (thousands) then replace comma with dot
             clean = clean.replace('.', '').replace(',', '.')
         else:
             # dot decimal => remove commas
             clean = clean.replace(',', '')
+    elif last_comma != -1 and clean.count(',') == 1 and len(clean) - last_comma - 1 in (2, 3):
+        # Single comma followed by 2-3 digits => decimal comma
+        clean = clean.replace(',', '.')
     else:
-        # Only one type or none
-        if clean.count(',') == 1 and len(clean.split(',')[-1]) in (2, 3):
-            clean = clean.replace(',', '.')
-        else:
-            clean = clean.replace(',', '')
+        clean = clean.replace(',', '')
     try:
         return float(clean), currency
     except Exception:
@@ -115,20 +172,12 @@ def build_product_url(domain: str, asin: str, title: str | None = None) -> str:
     # This format works better for products that might have routing issues
     base_url = f"https://{domain}/gp/product/{asin}"
     
-    # Add affiliate tag via with_affiliate
-    url_with_tag = with_affiliate(base_url)
-    
-    # Add ref parameter to help Amazon identify the source (reduces routing issues)
-    try:
-        u = urlparse(url_with_tag)
-        qs = dict(parse_qsl(u.query, keep_blank_values=True))
-        # Add ref parameter if not already present
-        if 'ref' not in qs:
-            qs['ref'] = 'nosim'  # "no similar items" - cleaner product page
-        new_query = urlencode(qs)
-        return urlunparse((u.scheme, u.netloc, u.path, u.params, new_query, u.fragment))
-    except Exception:
-        return url_with_tag
+    # Affiliate tag + ref parameter ("no similar items", cleaner product page that helps
+    # Amazon identify the source) emitted directly: the base URL has no query to merge
+    tag = (config.affiliate_tag or "").strip()
+    if tag:
+        return f"{base_url}?tag={quote_plus(tag)}&ref=nosim"
+    return f"{base_url}?ref=nosim"
 
 # --- New helpers for Amazon App shared links / short links ---
 SHORT_AMAZON_DOMAINS = {"amzn.to", "amzn.eu", "amzn.in", "amzn.asia", "a.co"}
@@ -151,12 +200,14 @@ _DOMAIN_CURRENCY = {
     'amazon.com': 'USD', 'amazon.ca': 'CAD', 'amazon.com.mx': 'MXN', 'amazon.co.jp': 'JPY', 'amazon.in': 'INR'
 }
 
+@lru_cache(maxsize=_HELPER_CACHE_SIZE)
 def domain_to_currency(domain: str | None) -> str:
     if not domain:
         return 'EUR'
     d = domain.lower()
     return _DOMAIN_CURRENCY.get(d, 'EUR')
 
+@lru_cache(maxsize=_HELPER_CACHE_SIZE)
 def currency_symbol(code: str | None) -> str:
     if not code:
         return '€'
@@ -176,25 +227,38 @@ def format_price(amount: float | None, currency: str | None) -> str:
     # Fallback: amount + space + code
     return f"{amount:.2f} {code}"
 
+@lru_cache(maxsize=_HELPER_CACHE_SIZE)
 def is_short_amazon(url: str) -> bool:
     try:
-        netloc = urlparse(url).netloc.lower()
+        host = urlsplit(url).hostname or ''
         # Strip leading www.
-        if netloc.startswith("www."):
-            netloc = netloc[4:]
-        return netloc in SHORT_AMAZON_DOMAINS
+        if host.startswith("www."):
+            host = host[4:]
+        return host in SHORT_AMAZON_DOMAINS
     except Exception:
         return False
 
 async def expand_short_amazon_url(url: str, timeout: int = 10) -> str:
     """Follow redirects for amzn.* short links to reach canonical /dp/ URL.
+    Tries a HEAD redirect chase first and only falls back to a GET when HEAD
+    did not land on a URL carrying an ASIN (e.g. 405 or a non-redirecting HEAD).
     Returns original url on failure.
     """
     if not is_short_amazon(url):
         return url
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout, headers={"User-Agent": config.user_agent}) as client:
-            resp = await client.get(url)
+        client = await get_client()
+        try:
+            resp = await client.head(url, timeout=timeout)
+            final = str(resp.url)
+            if resp.status_code != 405 and extract_asin(final):
+                logger.debug("Short link expanded", url=url, final=final, method="HEAD", http_version=resp.http_version)
+                return final
+        except httpx.HTTPError:
+            pass
+        # Only the final URL matters: stream the response and never read the body
+        async with client.stream("GET", url, timeout=timeout) as resp:
+            logger.debug("Short link expanded", url=url, final=str(resp.url), method="GET", http_version=resp.http_version)
             return str(resp.url)
     except Exception:
         return url